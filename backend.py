@@ -9,27 +9,86 @@ Purpose: Core backend module for the Ventoy Flasher application.
          values, and downloading/extracting files. Also includes multi-level logging.
 Description:
     - Implements the FlashUtility class, which encapsulates OS-dependent operations.
-    - Contains global constants for logging levels and a dictionary (PREDEFINED_OS)
+    - Contains global constants for logging levels and loads a catalog (predefined_os.json)
       with download URLs and expected SHA256 hash placeholders for many Linux/Unix distributions.
     - All functions include detailed docstrings, error handling, and logging.
 Variables:
     LOG_DEBUG, LOG_INFO, LOG_WARNING, LOG_ERROR: Logging level constants.
-    PREDEFINED_OS: Dictionary mapping OS names to download metadata.
+    HASH_CHUNK_SIZE: Read size in bytes used when hashing files.
+    HASH_SLICE_SIZE, HASH_PROGRESS_INTERVAL: mmap hashing step and progress cadence.
+    FAST_HASH_CHUNK_SIZE: Read size in bytes for fast (xxh3/blake3) verification hashes.
+    DOWNLOAD_CHUNK_SIZE: Chunk size in bytes used when streaming downloads.
+    DOWNLOAD_TIMEOUT: (connect, read) timeouts in seconds for download requests.
+    DOWNLOAD_PROGRESS_INTERVAL: How many downloaded bytes pass between progress log messages.
+    HTTP_USER_AGENT: User-Agent header sent by the shared HTTP session.
+    LINK_CHECK_WORKERS: Maximum number of concurrent HEAD probes when validating links.
+    LINK_CACHE_TTL: Lifetime in seconds of cached link-probe status codes.
+    RANGED_DOWNLOAD_MIN_SIZE, RANGED_DOWNLOAD_WORKERS: Threshold and parallelism for ranged downloads.
+    DOWNLOAD_RESUME_ATTEMPTS: How often an interrupted single-stream download is resumed.
+    COPY_CHUNK_SIZE, COPY_BUFFER_SIZE: In-kernel copy step and user-space fallback buffer for ISO copies.
+    DD_BLOCK_SIZE, DD_PROGRESS_INTERVAL: Block size and progress cadence for flashing.
+    HASH_CACHE_PATH, HASH_CACHE_MAX_ENTRIES: JSON file persisting computed SHA256 digests, and its size bound.
+    LSBLK_COLUMNS, LSBLK_CACHE_TTL: lsblk output columns and the lifetime of its cached result.
+    VIRTUAL_DISK_PREFIXES: Device name prefixes skipped when listing disks through pyudev.
+    PREDEFINED_OS_PATH: JSON catalog mapping OS names to download metadata (see predefined_os()).
     VENTOY_URLS: Dictionary containing download URLs for Ventoy (Linux and Windows).
 Usage:
     Import this module in your GUI application (or other code) and instantiate FlashUtility.
 """
 
 import os
+import errno
+import sys
 import platform
+import re
+import shlex
+import stat
 import subprocess
 import tempfile
 import shutil
 import json
+import functools
 import hashlib
+import io
+import mmap
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import tarfile
 import zipfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Optional: BLAKE3 (SIMD-parallel) speeds up local read-back verification; SHA256 is used without it.
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# Optional: xxHash (XXH3) is a non-cryptographic hash for local integrity checks, far faster than SHA256.
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Optional: pyudev enumerates block devices from sysfs/udev in-process; lsblk is spawned without it.
+try:
+    import pyudev
+except ImportError:
+    pyudev = None
+
+# Optional: orjson parses lsblk's JSON output faster than the stdlib json module.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: ISA-L's igzip is a drop-in GzipFile with SIMD-accelerated inflate; stdlib gzip otherwise.
+try:
+    from isal import igzip as gzip_mod
+except ImportError:
+    import gzip as gzip_mod
 
 # ----------------------------
 # Logging level constants.
@@ -39,83 +98,119 @@ LOG_WARNING = 30
 LOG_ERROR = 40
 
 # ----------------------------
-# Predefined OS installers dictionary.
-# Update the 'hash' values with the actual expected SHA256 hashes.
-PREDEFINED_OS = {
-    "ParrotOS Home Edition": {
-        "url": "https://cdimage.parrot.sh/parrot/iso/ParrotSecurity-4.11_amd64.iso",
-        "hash": "dummyhash_parrot"
-    },
-    "NetBSD 9.3": {
-        "url": "https://cdn.netbsd.org/pub/NetBSD/NetBSD-9.3/NetBSD-9.3-amd64.iso",
-        "hash": "dummyhash_netbsd"
-    },
-    "Ubuntu Server 22.04": {
-        "url": "https://releases.ubuntu.com/22.04/ubuntu-22.04-live-server-amd64.iso",
-        "hash": "dummyhash_ubuntu_server_22"
-    },
-    "Debian 11 (Netinst)": {
-        "url": "https://cdimage.debian.org/debian-cd/current/amd64/iso-cd/debian-11.7.0-amd64-netinst.iso",
-        "hash": "dummyhash_debian"
-    },
-    "Ubuntu 22.04 Desktop": {
-        "url": "https://releases.ubuntu.com/22.04/ubuntu-22.04-desktop-amd64.iso",
-        "hash": "dummyhash_ubuntu_desktop_22"
-    },
-    "Ubuntu Jammy Jellyfish": {
-        "url": "https://releases.ubuntu.com/22.04/ubuntu-22.04-desktop-amd64.iso",
-        "hash": "dummyhash_ubuntu_jammy"
-    },
-    "Fedora Workstation 37": {
-        "url": "https://download.fedoraproject.org/pub/fedora/linux/releases/37/Workstation/x86_64/iso/Fedora-Workstation-Live-x86_64-37-1.6.iso",
-        "hash": "dummyhash_fedora"
-    },
-    "OpenSUSE Leap 15.4": {
-        "url": "https://download.opensuse.org/distribution/leap/15.4/iso/openSUSE-Leap-15.4-DVD-x86_64.iso",
-        "hash": "dummyhash_opensuse"
-    },
-    "Arch Linux": {
-        "url": "https://mirror.rackspace.com/archlinux/iso/latest/archlinux-x86_64.iso",
-        "hash": "dummyhash_arch"
-    },
-    "AlmaLinux 9": {
-        "url": "https://repo.almalinux.org/almalinux/9/isos/x86_64/AlmaLinux-9.0-x86_64-dvd1.iso",
-        "hash": "dummyhash_almalinux"
-    },
-    "Pop!_OS 22.04": {
-        "url": "https://pop-iso.sfo2.cdn.digitaloceanspaces.com/22.04/Pop_OS_22.04_amd64_intel_60.iso",
-        "hash": "dummyhash_popos"
-    },
-    "Puppy Linux 9.5": {
-        "url": "https://distro.ibiblio.org/puppylinux/puppy-9.5/puppy-9.5_2019-08-14.iso",
-        "hash": "dummyhash_puppy"
-    },
-    "Linux Mint 21": {
-        "url": "https://mirrors.edge.kernel.org/linuxmint/stable/21/linuxmint-21-cinnamon-64bit.iso",
-        "hash": "dummyhash_mint"
-    },
-    "Tiny Core Linux 12.1": {
-        "url": "http://tinycorelinux.net/12.x/x86/release/TinyCorePure64-12.1.iso",
-        "hash": "dummyhash_tinycore"
-    },
-    "Kali Linux 2022.4": {
-        "url": "https://cdimage.kali.org/kali-2022.4/kali-linux-2022.4-installer-amd64.iso",
-        "hash": "dummyhash_kali"
-    },
-    # Additional Ubuntu flavors and versions
-    "Ubuntu 20.04 LTS Desktop": {
-        "url": "https://releases.ubuntu.com/20.04/ubuntu-20.04.5-desktop-amd64.iso",
-        "hash": "dummyhash_ubuntu20_desktop"
-    },
-    "Ubuntu 20.04 LTS Server": {
-        "url": "https://releases.ubuntu.com/20.04/ubuntu-20.04-live-server-amd64.iso",
-        "hash": "dummyhash_ubuntu20_server"
-    },
-    "Ubuntu Minimal 20.04": {
-        "url": "https://cdimage.ubuntu.com/ubuntu-minimal/releases/20.04/release/ubuntu-minimal-20.04.5-amd64.iso",
-        "hash": "dummyhash_ubuntu_minimal"
-    }
-}
+# Read size used when hashing files (1 MiB amortizes syscall and interpreter overhead).
+HASH_CHUNK_SIZE = 1 << 20
+# Slice of an mmapped file passed to one hash update (each still runs in C with the GIL released),
+# and how often hashing progress is logged.
+HASH_SLICE_SIZE = 64 << 20
+HASH_PROGRESS_INTERVAL = 512 << 20
+# Chunk and write-buffer size for HTTP downloads (MB-scale chunks avoid tiny write syscalls).
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+# (connect, read) timeouts in seconds for download requests, so a stalled mirror cannot hang a transfer.
+DOWNLOAD_TIMEOUT = (5, 30)
+# User-Agent sent with every HTTP request (identifies the tool to mirrors instead of a bare python-requests).
+HTTP_USER_AGENT = "VentoyFlasher/1.0"
+# Upper bound on concurrent HEAD probes in check_links; matches the HTTP pool size so every
+# probe gets a pooled connection instead of one that is discarded afterwards.
+LINK_CHECK_WORKERS = 16
+# How long (seconds) a successful HEAD probe's status code is reused before the URL is probed again.
+LINK_CACHE_TTL = 300.0
+# Files at least this large are fetched as parallel HTTP Range requests when the server allows it.
+RANGED_DOWNLOAD_MIN_SIZE = 64 << 20
+RANGED_DOWNLOAD_WORKERS = 4
+# Times a single-stream download is attempted (resuming with a Range request) before giving up.
+DOWNLOAD_RESUME_ATTEMPTS = 3
+# Downloads log their progress each time another DOWNLOAD_PROGRESS_INTERVAL bytes have arrived.
+DOWNLOAD_PROGRESS_INTERVAL = 64 << 20
+# Bytes moved per copy_file_range/sendfile call when copying ISOs (progress is logged after each step).
+COPY_CHUNK_SIZE = 256 << 20
+# User-space buffer for the last-resort copy loop (the 64 KiB default costs a syscall pair per 64 KiB).
+COPY_BUFFER_SIZE = 16 << 20
+# Block size for in-process flashing, and how often flashing progress is logged.
+DD_BLOCK_SIZE = 16 << 20
+DD_PROGRESS_INTERVAL = 256 << 20
+# Byte count at the start of each `dd status=progress` report (and of its final summary line).
+_dd_bytes_re = re.compile(rb"^(\d+) bytes")
+# O_DIRECT transfers must be a multiple of the device's logical block size.
+DIRECT_IO_ALIGNMENT = 4096
+# Read size for fast (non-SHA256) verification hashes.
+FAST_HASH_CHUNK_SIZE = 4 << 20
+
+# SHA-256 constructor bound once; hashlib's OpenSSL backend uses SHA-NI where the CPU supports it.
+_sha256 = hashlib.sha256
+
+# ----------------------------
+# On-disk cache of computed SHA256 digests, validated against each file's size and mtime.
+HASH_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "usb_installer", "hashes.json")
+# Maximum number of cached digests; the least frequently used entries are evicted first.
+HASH_CACHE_MAX_ENTRIES = 256
+
+# ----------------------------
+# Columns requested from lsblk, and how long (seconds) its parsed output is reused.
+LSBLK_COLUMNS = "NAME,FSTYPE,SIZE,TYPE,MOUNTPOINT,LABEL,MODEL"
+LSBLK_CACHE_TTL = 2.0
+# Kernel name prefixes of virtual "disk" devices that lsblk reports under another type (loop, rom, ...).
+VIRTUAL_DISK_PREFIXES = ("loop", "ram", "zram", "dm-", "md", "sr", "nbd")
+
+# ----------------------------
+# Predefined OS installers catalog, stored next to this module and loaded on first use.
+# Update the 'hash' values in the JSON file with the actual expected SHA256 hashes.
+PREDEFINED_OS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "predefined_os.json")
+
+@functools.lru_cache(maxsize=None)
+def predefined_os():
+    """
+    Load the predefined OS catalog (OS name -> {"url", "hash"}) from PREDEFINED_OS_PATH.
+    The file is read once; every call returns the same dictionary, so entries removed
+    during the session (e.g. unreachable links) stay removed.
+    Returns:
+        dict: The predefined OS catalog.
+    """
+    with open(PREDEFINED_OS_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+# ----------------------------
+# Precompiled matcher locating a predefined OS name inside an ISO filename, and the reverse
+# map from expected SHA256 digest to OS name (both built on first use).
+_distro_re = None
+_distro_names = None
+_sha_to_name = None
+
+def rebuild_distro_matcher():
+    """
+    Recompile the filename matcher and the digest lookup from the current predefined_os() entries.
+    Call this whenever the catalog is modified.
+    """
+    global _distro_re, _distro_names, _sha_to_name
+    _distro_names = {name.lower(): name for name in predefined_os()}
+    _sha_to_name = {info["hash"].lower(): name for name, info in predefined_os().items() if info.get("hash")}
+    # Longest names first so the most specific entry wins at a given position.
+    pattern = "|".join(re.escape(name) for name in sorted(_distro_names, key=len, reverse=True))
+    _distro_re = re.compile(pattern, re.IGNORECASE) if pattern else None
+
+def match_predefined_os(iso_name):
+    """
+    Find the predefined OS entry whose name appears in the given ISO filename (case-insensitive).
+    Returns:
+        str: The matching OS name, or None if there is no match.
+    """
+    if _distro_names is None:
+        rebuild_distro_matcher()
+    match = _distro_re.search(iso_name) if _distro_re else None
+    return _distro_names[match.group(0).lower()] if match else None
+
+def match_predefined_sha256(digest):
+    """
+    Find the predefined OS entry whose expected hash equals the given SHA256 digest.
+    Args:
+        digest (str): Lowercase hexadecimal SHA256 digest.
+    Returns:
+        str: The matching OS name, or None if there is no match.
+    """
+    if _sha_to_name is None:
+        rebuild_distro_matcher()
+    return _sha_to_name.get(digest)
+
 
 # ----------------------------
 # Ventoy download URLs.
@@ -124,6 +219,11 @@ VENTOY_URLS = {
     "Windows": "https://github.com/ventoy/Ventoy/releases/download/v1.0.90/ventoy-1.0.90-windows.zip"
 }
 
+# ----------------------------
+class OperationCancelled(Exception):
+    """Raised inside a long transfer (flash, copy, download, hash) after cancel(stop_all=True)."""
+
+
 # ----------------------------
 class FlashUtility:
     """
@@ -133,12 +233,41 @@ class FlashUtility:
     Attributes:
         os_type (str): The name of the operating system.
         log_callback (function): A callback function for logging messages.
+        progress_callback (function): Optional callback(label, percent) invoked from the working
+            thread whenever a long transfer's completed percentage changes.
+        use_direct_io (bool): Flash in-process with O_DIRECT when possible; False always uses sudo dd.
         temp_dir (str): Temporary directory path for downloads/extractions.
+        http (requests.Session): Shared HTTP session; reuses pooled connections and retries transient failures.
+        udev (pyudev.Context): udev context used to enumerate disks, or None to use lsblk.
+        digest_cache (dict): Known SHA256 digests keyed by absolute path, each stored with the
+            file's size, mtime (ns) and hit count; persisted to HASH_CACHE_PATH.
     """
-    def __init__(self, log_callback=None):
+    def __init__(self, log_callback=None, use_direct_io=True, progress_callback=None):
         self.os_type = platform.system()  # Detect operating system
         self.log_callback = log_callback   # Logging callback function
+        self.progress_callback = progress_callback
+        self.use_direct_io = use_direct_io
         self.temp_dir = tempfile.mkdtemp(prefix="ventoy_")
+        self.http = requests.Session()
+        self.http.headers["User-Agent"] = f"{HTTP_USER_AGENT} {self.http.headers.get('User-Agent', '')}".strip()
+        # One pool per mirror host: the catalog spans more than 8 hosts, so keep 16 pools alive.
+        adapter = HTTPAdapter(pool_connections=LINK_CHECK_WORKERS, pool_maxsize=LINK_CHECK_WORKERS,
+                              max_retries=Retry(total=3, backoff_factor=0.3))
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+        self._digest_lock = threading.Lock()
+        self.digest_cache = self._load_digest_cache()  # Avoids re-reading unchanged files
+        self._lsblk_cache = None           # (timestamp, parsed lsblk JSON)
+        self.udev = None                   # pyudev.Context when pyudev and libudev are available
+        if pyudev is not None and self.os_type == "Linux":
+            try:
+                self.udev = pyudev.Context()
+            except ImportError as ex:  # pyudev raises ImportError when libudev cannot be loaded
+                self.log(f"pyudev unavailable ({ex}); using lsblk.", LOG_DEBUG)
+        self._device_observer = None       # pyudev.MonitorObserver started by start_device_monitor
+        self._process = None               # External command being run, for cancel()
+        self._stop_all = threading.Event()  # Set by cancel(stop_all=True); stops in-process transfers
+        self._link_cache = {}              # url -> (timestamp, HTTP status code)
         self.log(f"Temporary directory created at {self.temp_dir}", LOG_DEBUG)
 
     def log(self, message, level=LOG_INFO):
@@ -148,17 +277,84 @@ class FlashUtility:
         else:
             print(message)
 
+    def check_block_device(self, usb_device):
+        """
+        Verify that usb_device is a block device and does not back the root filesystem.
+        Uses only os.stat, sysfs and /proc/mounts (no lsblk spawn). Always passes on non-Linux systems.
+        Returns:
+            bool: True if the device is safe to write to, False otherwise.
+        """
+        if self.os_type != "Linux":
+            return True
+        try:
+            st = os.stat(usb_device)
+        except OSError as ex:
+            self.log(f"Cannot access {usb_device}: {ex}", LOG_ERROR)
+            return False
+        if not stat.S_ISBLK(st.st_mode):
+            self.log(f"{usb_device} is not a block device.", LOG_ERROR)
+            return False
+        if self._backing_disks(usb_device) & self._root_disks():
+            self.log(f"Refusing to write to {usb_device}: it holds the root filesystem.", LOG_ERROR)
+            return False
+        return True
+
+    def _root_disks(self):
+        """
+        Return the kernel names of the disks backing the root filesystem, read from /proc/mounts.
+        """
+        try:
+            with open("/proc/mounts", "r") as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) >= 2 and fields[1] == "/" and fields[0].startswith("/dev/"):
+                        return self._backing_disks(fields[0])
+        except OSError as ex:
+            self.log(f"Could not read /proc/mounts: {ex}", LOG_WARNING)
+        return set()
+
+    @staticmethod
+    def _backing_disks(device):
+        """
+        Resolve a device node (disk, partition, or device-mapper volume) to the set of
+        whole-disk kernel names it lives on, using sysfs (e.g. /dev/nvme0n1p2 -> {"nvme0n1"}).
+        """
+        name = os.path.basename(os.path.realpath(device))
+        sys_path = os.path.realpath(os.path.join("/sys/class/block", name))
+        slaves_dir = os.path.join(sys_path, "slaves")
+        if os.path.isdir(slaves_dir) and os.listdir(slaves_dir):
+            disks = set()
+            for slave in os.listdir(slaves_dir):
+                disks |= FlashUtility._backing_disks(os.path.join("/dev", slave))
+            return disks
+        if os.path.exists(os.path.join(sys_path, "partition")):
+            return {os.path.basename(os.path.dirname(sys_path))}
+        return {name}
+
     def run_dd_command(self, iso_path, usb_device):
         """
         Run the dd command to flash an ISO image onto a USB device.
-        For Linux, this command requires sudo privileges. For Windows, a placeholder is provided.
+        For Linux, the image is written in-process when use_direct_io is set and the device is
+        writable by the current user; otherwise dd is run through sudo. For Windows, a placeholder is provided.
+        Returns:
+            bool: True if the image was written, False otherwise.
         """
+        if not self.check_block_device(usb_device):
+            return False
         try:
-            if self.os_type == "Linux":
-                command = f"sudo dd if={iso_path} of={usb_device} bs=4M status=progress && sync"
-                self.log(f"Running dd command: {command}", LOG_INFO)
-                subprocess.run(command, shell=True, check=True)
+            if self.os_type == "Linux" and self.use_direct_io and os.access(usb_device, os.W_OK):
+                self.log(f"Flashing {iso_path} to {usb_device} with direct I/O", LOG_INFO)
+                self._pv_dd(iso_path, usb_device)
+                self.log("Flashing complete.", LOG_INFO)
+                return True
+            elif self.os_type == "Linux":
+                # conv=fsync flushes the device before dd exits, replacing a separate `sync`.
+                command = ["sudo", "dd", f"if={iso_path}", f"of={usb_device}", f"bs={DD_BLOCK_SIZE >> 20}M",
+                           "status=progress", "conv=fsync"]
+                self.log(f"Running dd command: {shlex.join(command)}", LOG_INFO)
+                self._run_dd(command, os.path.getsize(iso_path))
                 self.log("Flashing complete using dd.", LOG_INFO)
+                return True
             elif self.os_type == "Windows":
                 self.log("dd command is not natively supported on Windows. Please install a dd equivalent.", LOG_WARNING)
             else:
@@ -167,39 +363,444 @@ class FlashUtility:
             self.log(f"Error during flashing: {e}", LOG_ERROR)
         except Exception as ex:
             self.log(f"Unexpected error: {ex}", LOG_ERROR)
+        finally:
+            self.invalidate_device_cache()
+        return False
+
+    def _run_command(self, command):
+        """
+        Run an external command to completion, like subprocess.run(command, check=True), while
+        keeping its handle in self._process so cancel() can stop it from another thread.
+        Raises:
+            subprocess.CalledProcessError: If the command exits with a non-zero status.
+        """
+        with subprocess.Popen(command) as proc:
+            self._process = proc
+            try:
+                returncode = proc.wait()
+            finally:
+                self._process = None
+        if returncode:
+            raise subprocess.CalledProcessError(returncode, command)
+
+    def cancel(self, stop_all=False):
+        """
+        Stop the external command (dd, parted, Ventoy installer) currently run by a long operation,
+        if any. Safe to call from any thread; the operation then fails with its usual error log.
+        Args:
+            stop_all (bool): Also stop in-process transfers (direct-I/O flashing, copies, downloads,
+                hashing) at their next progress step, and every transfer started afterwards.
+                Intended for application shutdown; it cannot be undone.
+        """
+        if stop_all:
+            self._stop_all.set()
+        proc = self._process
+        if proc is not None and proc.poll() is None:
+            self.log(f"Cancelling: {shlex.join(proc.args)}", LOG_WARNING)
+            proc.terminate()
+
+    def _run_dd(self, command, total):
+        """
+        Run a dd command with status=progress, turning its reports into log messages every
+        DD_PROGRESS_INTERVAL bytes. dd redraws its progress line with carriage returns on stderr,
+        so the unbuffered stream is split on both \\r and \\n; other lines are logged at debug level.
+        dd runs with LC_ALL=C because the progress pattern only matches its untranslated output.
+        Args:
+            command (list): dd argv.
+            total (int): Expected number of bytes, used for the percentage.
+        Raises:
+            subprocess.CalledProcessError: If dd exits with a non-zero status.
+        """
+        advance = self._progress_reporter("Flashed", total, DD_PROGRESS_INTERVAL)
+        reported = 0
+        pending = b""
+        with subprocess.Popen(command, stderr=subprocess.PIPE, bufsize=0, env={**os.environ, "LC_ALL": "C"}) as proc:
+            self._process = proc
+            try:
+                while True:
+                    data = proc.stderr.read(4096)
+                    if not data:
+                        break
+                    *lines, pending = re.split(rb"[\r\n]", pending + data)
+                    for line in lines:
+                        match = _dd_bytes_re.match(line)
+                        if match:
+                            done = int(match.group(1))
+                            advance(done - reported)
+                            reported = done
+                        elif line.strip():
+                            self.log(line.decode(errors="replace"), LOG_DEBUG)
+            finally:
+                self._process = None
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, command)
+
+    def _check_cancelled(self):
+        """Raise OperationCancelled if cancel(stop_all=True) has been called."""
+        if self._stop_all.is_set():
+            raise OperationCancelled("operation cancelled")
+
+    def _progress_reporter(self, verb, total, interval):
+        """
+        Build a thread-safe advance(nbytes) callable for a long transfer. It logs
+        "<verb> X of Y MiB (Z%)" each time another `interval` bytes have been processed
+        (just "<verb> X MiB" when total is 0, i.e. unknown), and passes each new whole
+        percentage to progress_callback. Each call first checks for cancellation.
+        """
+        lock = threading.Lock()
+        state = {"done": 0, "next": interval, "percent": -1}
+
+        def advance(nbytes):
+            self._check_cancelled()
+            with lock:
+                state["done"] += nbytes
+                done = state["done"]
+                percent = min(done * 100 // total, 100) if total else -1
+                changed = percent != state["percent"]
+                state["percent"] = percent
+                report = done >= state["next"]
+                if report:
+                    state["next"] = done - done % interval + interval
+            if changed and self.progress_callback:
+                self.progress_callback(verb, percent)
+            if not report:
+                return
+            if total:
+                self.log(f"{verb} {done >> 20} of {total >> 20} MiB ({percent}%)", LOG_INFO)
+            else:
+                self.log(f"{verb} {done >> 20} MiB", LOG_INFO)
+        return advance
+
+    def _pv_dd(self, iso_path, usb_device, bs=DD_BLOCK_SIZE):
+        """
+        Write an ISO image to a block device without spawning dd.
+        The device is opened with O_DIRECT so data bypasses the page cache, and a single fdatasync
+        at the end replaces per-write syncs. An anonymous mmap provides the page-aligned buffer that
+        O_DIRECT requires. The ISO's SHA256 is computed from the same buffer (and stored in
+        digest_cache), and progress is logged every DD_PROGRESS_INTERVAL bytes.
+        """
+        import fcntl  # POSIX-only; this path is used on Linux exclusively.
 
-    def download_file(self, url, dest_filename):
+        total = os.path.getsize(iso_path)
+        sha256_hash = _sha256()
+        buf = mmap.mmap(-1, bs)
+        view = memoryview(buf)
+        src = os.open(iso_path, os.O_RDONLY)
+        dst = None
+        try:
+            dst = os.open(usb_device, os.O_WRONLY | os.O_DIRECT)
+            advance = self._progress_reporter("Flashed", total, DD_PROGRESS_INTERVAL)
+            while True:
+                n = os.readv(src, [buf])
+                if n == 0:
+                    break
+                sha256_hash.update(view[:n])
+                if n % DIRECT_IO_ALIGNMENT:
+                    # An unaligned tail cannot go through O_DIRECT; finish via the page cache.
+                    flags = fcntl.fcntl(dst, fcntl.F_GETFL)
+                    fcntl.fcntl(dst, fcntl.F_SETFL, flags & ~os.O_DIRECT)
+                done = 0
+                while done < n:
+                    done += os.write(dst, view[done:n])
+                advance(n)
+            os.fdatasync(dst)
+            self._store_digest(iso_path, sha256_hash.hexdigest())
+        finally:
+            if dst is not None:
+                os.close(dst)
+            os.close(src)
+            view.release()
+            buf.close()
+
+    def download_file(self, url, dest_filename, expected_sha256=None):
         """
         Download a file from the given URL to the temporary directory.
+        Large files on servers that accept byte ranges are fetched with parallel Range requests
+        and hashed afterwards; otherwise the SHA256 digest is computed while streaming. Either way
+        it is stored in the digest cache, so a later compute_sha256 call does not re-read the file.
+        Progress is logged every DOWNLOAD_PROGRESS_INTERVAL bytes, and interrupted single-stream
+        transfers are resumed from the partial file.
+        Args:
+            url (str): Source URL.
+            dest_filename (str): File name to create inside the temporary directory.
+            expected_sha256 (str): If given, the download is rejected (and deleted) when its digest differs.
         Returns:
             str: The full path of the downloaded file or None if failed.
         """
         dest_path = os.path.join(self.temp_dir, dest_filename)
         self.log(f"Downloading from {url} to {dest_path}", LOG_INFO)
         try:
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-            with open(dest_path, "wb") as f:
-                shutil.copyfileobj(response.raw, f)
+            digest = None
+            # An interrupted earlier attempt left a partial file: resume it rather than start over.
+            ranged = None if os.path.exists(dest_path + ".part") else self._probe_ranged_download(url)
+            if ranged:
+                final_url, size = ranged
+                try:
+                    self._download_ranged(final_url, dest_path, size)
+                    digest = self._sha256_mmap(dest_path) or self._sha256_stream(dest_path)
+                except requests.RequestException as e:
+                    self.log(f"Parallel download failed ({e}); retrying as a single stream.", LOG_WARNING)
+            if digest is None:
+                digest = self._download_stream(url, dest_path)
+            if expected_sha256 and digest != expected_sha256.lower():
+                os.remove(dest_path)
+                self.log(f"SHA256 mismatch for {url}: expected {expected_sha256}, got {digest}", LOG_ERROR)
+                return None
+            self._store_digest(dest_path, digest)
             self.log(f"Download complete: {dest_path}", LOG_INFO)
             return dest_path
-        except requests.RequestException as e:
+        except (requests.RequestException, OSError) as e:
             self.log(f"Error downloading file: {e}", LOG_ERROR)
             return None
+        except OperationCancelled:
+            self.log(f"Download of {url} cancelled.", LOG_WARNING)
+            return None
+
+    def _download_stream(self, url, dest_path):
+        """
+        Download url into dest_path over a single connection, hashing each chunk as it is written.
+        Data is written to dest_path + ".part" and renamed into place once complete. If the connection
+        drops, the transfer resumes from the bytes already on disk with a Range request (up to
+        DOWNLOAD_RESUME_ATTEMPTS times; a later call for the same file resumes as well). The server's
+        validator is kept in dest_path + ".part.validator" while the download is incomplete.
+        Returns:
+            str: The SHA256 hexadecimal digest of the downloaded data.
+        """
+        part_path = dest_path + ".part"
+        for attempt in range(1, DOWNLOAD_RESUME_ATTEMPTS + 1):
+            try:
+                digest = self._download_part(url, part_path)
+                break
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                if attempt == DOWNLOAD_RESUME_ATTEMPTS:
+                    raise
+                self.log(f"Download interrupted ({e}); resuming.", LOG_WARNING)
+        os.replace(part_path, dest_path)
+        try:
+            os.remove(part_path + ".validator")
+        except FileNotFoundError:
+            pass
+        return digest
+
+    def _download_part(self, url, part_path):
+        """
+        Fetch url into part_path, continuing after any bytes it already holds when the server
+        honours a Range request (otherwise the file is rewritten from the start). The Range request
+        carries the ETag or Last-Modified value saved with the partial file as If-Range, so a server
+        whose copy has changed since sends the whole new file instead; without a saved validator the
+        download starts over. Existing bytes are hashed first so the returned digest covers the whole file. When the size is known the
+        remainder is preallocated with posix_fallocate, giving contiguous extents and fewer metadata
+        updates while it grows; on return or failure the file is cut back to the bytes received.
+        Returns:
+            str: The SHA256 hexadecimal digest of the complete file.
+        """
+        validator_path = part_path + ".validator"
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        validator = None
+        if offset:
+            try:
+                with open(validator_path, encoding="utf-8") as f:
+                    validator = f.read().strip()
+            except OSError:
+                pass
+            if not validator:
+                offset = 0  # Nothing to tell whether the server's file is still the one we started on.
+        headers = {"Range": f"bytes={offset}-", "If-Range": validator} if offset else None
+        with self.http.get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+            if response.status_code == 416 and offset:
+                # Range not satisfiable: the partial file is stale (or already complete); start over.
+                os.remove(part_path)
+                return self._download_part(url, part_path)
+            response.raise_for_status()
+            if response.status_code != 206:
+                offset = 0
+                self._save_validator(validator_path, response)
+            sha256_hash = _sha256()
+            if offset:
+                self.log(f"Resuming download at {offset >> 20} MiB", LOG_INFO)
+                self._hash_prefix(part_path, offset, sha256_hash)
+            fd = os.open(part_path, os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+            os.ftruncate(fd, offset)
+            os.lseek(fd, offset, os.SEEK_SET)
+            length = self._content_length(response)
+            if length > 0 and hasattr(os, "posix_fallocate"):
+                try:
+                    os.posix_fallocate(fd, offset, length)
+                except OSError as ex:
+                    self.log(f"Could not preallocate {part_path}: {ex}", LOG_DEBUG)
+            advance = self._progress_reporter("Downloaded", offset + length if length else 0,
+                                              DOWNLOAD_PROGRESS_INTERVAL)
+            advance(offset)
+            with os.fdopen(fd, "wb", buffering=DOWNLOAD_CHUNK_SIZE) as f:
+                try:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        sha256_hash.update(chunk)
+                        advance(len(chunk))
+                finally:
+                    # Drop preallocated space that was not written (Content-Length counts encoded
+                    # bytes, and an interrupted transfer must leave only real data to resume from).
+                    f.truncate(f.tell())
+                f.flush()
+                os.fsync(f.fileno())
+        return sha256_hash.hexdigest()
+
+    @staticmethod
+    def _save_validator(validator_path, response):
+        """
+        Store the response's strong ETag (or else its Last-Modified date) for a later If-Range
+        resume; with neither available, any stale validator file is removed.
+        """
+        etag = response.headers.get("ETag", "")
+        validator = etag if etag and not etag.startswith("W/") else response.headers.get("Last-Modified")
+        if validator:
+            with open(validator_path, "w", encoding="utf-8") as f:
+                f.write(validator)
+        else:
+            try:
+                os.remove(validator_path)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _content_length(response):
+        """
+        Parse a response's Content-Length header.
+        Returns:
+            int: The length in bytes, or 0 (unknown) if the header is missing or malformed.
+        """
+        try:
+            return max(int(response.headers.get("Content-Length") or 0), 0)
+        except ValueError:
+            return 0
+
+    def _probe_ranged_download(self, url):
+        """
+        HEAD the URL to decide whether a parallel ranged download is worthwhile.
+        Returns:
+            tuple: (final_url, size) if the server accepts byte ranges and the file is at least
+            RANGED_DOWNLOAD_MIN_SIZE bytes, otherwise None.
+        """
+        if not hasattr(os, "pwrite"):
+            return None
+        try:
+            response = self.http.head(url, allow_redirects=True, timeout=10)
+        except requests.RequestException:
+            return None
+        size = self._content_length(response)
+        if (response.status_code == 200 and size >= RANGED_DOWNLOAD_MIN_SIZE
+                and response.headers.get("Accept-Ranges", "").lower() == "bytes"):
+            # Pin the resolved mirror so every range comes from the same server.
+            return response.url, size
+        return None
+
+    def _download_ranged(self, url, dest_path, size, workers=RANGED_DOWNLOAD_WORKERS):
+        """
+        Download url into dest_path using `workers` parallel HTTP Range requests.
+        The file is preallocated and each worker writes its slice at the matching offset with os.pwrite,
+        so several TCP connections share the link instead of one congestion-window-limited stream.
+        """
+        part = -(-size // workers)
+        advance = self._progress_reporter("Downloaded", size, DOWNLOAD_PROGRESS_INTERVAL)
+        fd = os.open(dest_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(fd, 0, size)
+            else:
+                os.ftruncate(fd, size)
+
+            def fetch(start):
+                end = min(start + part, size) - 1
+                with self.http.get(url, headers={"Range": f"bytes={start}-{end}"}, stream=True,
+                                   timeout=DOWNLOAD_TIMEOUT) as response:
+                    if response.status_code != 206:
+                        raise requests.RequestException(f"range request returned status {response.status_code}")
+                    offset = start
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        view = memoryview(chunk)
+                        while view:
+                            written = os.pwrite(fd, view, offset)
+                            view = view[written:]
+                            offset += written
+                            advance(written)
+                if offset != end + 1:
+                    raise requests.RequestException(f"incomplete range {start}-{end}")
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(fetch, range(0, size, part)))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def download_many(self, url_name_pairs, max_workers=4):
+        """
+        Download several files concurrently into the temporary directory.
+        Each transfer streams (and hashes) through download_file, so several TCP flows
+        share the link instead of fetching multi-GB ISOs one after another.
+        Args:
+            url_name_pairs (iterable): (url, dest_filename) tuples.
+            max_workers (int): Maximum number of simultaneous downloads.
+        Returns:
+            dict: Maps each dest_filename to its downloaded path, or None if that download failed.
+        """
+        pairs = list(url_name_pairs)
+        if not pairs:
+            return {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            paths = executor.map(lambda pair: self.download_file(*pair), pairs)
+            return {name: path for (_, name), path in zip(pairs, paths)}
+
+    def check_links(self, urls, timeout=5, force=False):
+        """
+        Probe several URLs with HEAD requests concurrently.
+        Network round-trips overlap, so total time is close to the slowest single probe.
+        Mirrors that refuse HEAD (403/405/501) are retried with a one-byte ranged GET whose body is
+        never read. Status codes are cached for LINK_CACHE_TTL seconds and reused unless force is set;
+        exceptions (timeouts, DNS failures) are never cached, so those URLs are always retried.
+        Returns:
+            dict: Maps each URL to its HTTP status code, or to the exception raised.
+        """
+        def probe(url):
+            try:
+                status = self.http.head(url, allow_redirects=True, timeout=timeout,
+                                        headers={"Accept-Encoding": "identity"}).status_code
+                if status in (403, 405, 501):
+                    with self.http.get(url, stream=True, timeout=timeout, headers={"Range": "bytes=0-0"}) as response:
+                        status = response.status_code
+            except Exception as ex:
+                return ex
+            self._link_cache[url] = (time.monotonic(), status)
+            return status
+
+        now = time.monotonic()
+        results = {}
+        pending = []
+        for url in dict.fromkeys(urls):  # Probe each distinct URL once.
+            cached = self._link_cache.get(url)
+            if cached and not force and now - cached[0] < LINK_CACHE_TTL:
+                results[url] = cached[1]
+            else:
+                pending.append(url)
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(len(pending), LINK_CHECK_WORKERS)) as executor:
+                results.update(zip(pending, executor.map(probe, pending)))
+        return results
 
     def extract_archive(self, archive_path, extract_to):
         """
         Extract an archive (tar.gz or zip) to the specified directory.
+        Tarballs are read in streaming mode ("r|"): a single forward pass with no seeking,
+        which keeps peak memory low. Decompression uses ISA-L's igzip when installed.
         Returns:
             bool: True if extraction succeeded, False otherwise.
         """
         self.log(f"Extracting {archive_path} to {extract_to}", LOG_INFO)
         try:
             if archive_path.endswith(".tar.gz"):
-                with tarfile.open(archive_path, "r:gz") as tar:
+                with gzip_mod.GzipFile(archive_path, "rb") as gz, tarfile.open(fileobj=gz, mode="r|") as tar:
                     tar.extractall(path=extract_to)
             elif archive_path.endswith(".zip"):
-                with zipfile.ZipFile(archive_path, "r") as zip_ref:
+                with zipfile.ZipFile(archive_path, "r", allowZip64=True) as zip_ref:
                     zip_ref.extractall(path=extract_to)
             else:
                 self.log("Unsupported archive format.", LOG_WARNING)
@@ -210,6 +811,73 @@ class FlashUtility:
             self.log(f"Extraction error: {ex}", LOG_ERROR)
             return False
 
+    def download_and_extract(self, url, extract_to):
+        """
+        Download an archive and extract it to the specified directory.
+        For .tar.gz archives extraction overlaps the download: chunks are written into a pipe, and a
+        separate thread decompresses it with gzip_mod and extracts it with a streaming ("r|") tarfile
+        reader, so the total time is roughly max(download, extract) instead of their sum. Zip archives
+        need random access, so the (small) Ventoy zip is buffered in memory rather than written to the
+        temporary directory.
+        Returns:
+            bool: True if download and extraction succeeded, False otherwise.
+        """
+        if url.endswith(".zip"):
+            self.log(f"Downloading and extracting {url} to {extract_to}", LOG_INFO)
+            try:
+                response = self.http.get(url, timeout=DOWNLOAD_TIMEOUT)
+                response.raise_for_status()
+                with zipfile.ZipFile(io.BytesIO(response.content), "r", allowZip64=True) as zip_ref:
+                    zip_ref.extractall(path=extract_to)
+            except requests.RequestException as e:
+                self.log(f"Error downloading file: {e}", LOG_ERROR)
+                return False
+            except Exception as ex:
+                self.log(f"Extraction error: {ex}", LOG_ERROR)
+                return False
+            self.log("Extraction complete.", LOG_INFO)
+            return True
+        if not url.endswith(".tar.gz"):
+            self.log("Unsupported archive format.", LOG_WARNING)
+            return False
+
+        self.log(f"Downloading and extracting {url} to {extract_to}", LOG_INFO)
+        read_fd, write_fd = os.pipe()
+        errors = []
+
+        def extract():
+            try:
+                with os.fdopen(read_fd, "rb") as pipe_in, gzip_mod.GzipFile(fileobj=pipe_in, mode="rb") as gz, \
+                        tarfile.open(fileobj=gz, mode="r|") as tar:
+                    tar.extractall(path=extract_to)
+            except Exception as ex:
+                errors.append(ex)
+
+        extractor = threading.Thread(target=extract, daemon=True)
+        extractor.start()
+        try:
+            with os.fdopen(write_fd, "wb") as pipe_out:
+                response = self.http.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT)
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    self._check_cancelled()
+                    pipe_out.write(chunk)
+        except BrokenPipeError:
+            pass  # The extractor stopped early; its error is reported below.
+        except requests.RequestException as e:
+            self.log(f"Error downloading file: {e}", LOG_ERROR)
+            return False
+        except OperationCancelled:
+            self.log(f"Download of {url} cancelled.", LOG_WARNING)
+            return False
+        finally:
+            extractor.join()
+        if errors:
+            self.log(f"Extraction error: {errors[0]}", LOG_ERROR)
+            return False
+        self.log("Extraction complete.", LOG_INFO)
+        return True
+
     def install_ventoy(self, usb_device):
         """
         Download and install Ventoy onto the specified USB device.
@@ -221,16 +889,10 @@ class FlashUtility:
                 self.log("No Ventoy download available for this OS.", LOG_ERROR)
                 return
 
-            archive_filename = os.path.basename(ventoy_url)
-            ventoy_archive = self.download_file(ventoy_url, archive_filename)
-            if not ventoy_archive:
-                self.log("Ventoy download failed.", LOG_ERROR)
-                return
-
             ventoy_extract_path = os.path.join(self.temp_dir, "ventoy_extracted")
             os.makedirs(ventoy_extract_path, exist_ok=True)
-            if not self.extract_archive(ventoy_archive, ventoy_extract_path):
-                self.log("Ventoy extraction failed.", LOG_ERROR)
+            if not self.download_and_extract(ventoy_url, ventoy_extract_path):
+                self.log("Ventoy download or extraction failed.", LOG_ERROR)
                 return
 
             if self.os_type == "Linux":
@@ -238,18 +900,18 @@ class FlashUtility:
                 if not os.path.exists(ventoy_script):
                     self.log("Ventoy installation script not found.", LOG_ERROR)
                     return
-                command = f"sudo sh {ventoy_script} -i {usb_device} -I"
-                self.log(f"Installing Ventoy with command: {command}", LOG_INFO)
-                subprocess.run(command, shell=True, check=True)
+                command = ["sudo", "sh", ventoy_script, "-i", usb_device, "-I"]
+                self.log(f"Installing Ventoy with command: {shlex.join(command)}", LOG_INFO)
+                self._run_command(command)
                 self.log("Ventoy installation complete.", LOG_INFO)
             elif self.os_type == "Windows":
                 ventoy_exe = os.path.join(ventoy_extract_path, "Ventoy2Disk.exe")
                 if not os.path.exists(ventoy_exe):
                     self.log("Ventoy installation executable not found.", LOG_ERROR)
                     return
-                command = f'"{ventoy_exe}" -i {usb_device} -I'
-                self.log(f"Installing Ventoy with command: {command}", LOG_INFO)
-                subprocess.run(command, shell=True, check=True)
+                command = [ventoy_exe, "-i", usb_device, "-I"]
+                self.log(f"Installing Ventoy with command: {subprocess.list2cmdline(command)}", LOG_INFO)
+                self._run_command(command)
                 self.log("Ventoy installation complete on Windows.", LOG_INFO)
             else:
                 self.log("Unsupported OS for Ventoy installation.", LOG_ERROR)
@@ -257,22 +919,77 @@ class FlashUtility:
             self.log(f"Error during Ventoy installation: {e}", LOG_ERROR)
         except Exception as ex:
             self.log(f"Unexpected error during Ventoy installation: {ex}", LOG_ERROR)
+        finally:
+            self.invalidate_device_cache()
 
     def copy_iso_to_ventoy(self, iso_path, ventoy_mount_point):
         """
         Copy the selected ISO file to the Ventoy USB drive.
         Ventoy will automatically detect and list the ISO files present.
+        Returns:
+            bool: True if the ISO was copied, False otherwise.
         """
         try:
             if not os.path.exists(ventoy_mount_point):
                 self.log("Ventoy mount point does not exist.", LOG_ERROR)
-                return
+                return False
             dest_path = os.path.join(ventoy_mount_point, os.path.basename(iso_path))
             self.log(f"Copying ISO from {iso_path} to {dest_path}", LOG_INFO)
-            shutil.copy2(iso_path, dest_path)
+            self._copy_file(iso_path, dest_path)
             self.log("ISO file successfully copied to Ventoy drive.", LOG_INFO)
+            return True
         except Exception as ex:
             self.log(f"Error copying ISO file: {ex}", LOG_ERROR)
+            return False
+
+    def _copy_file(self, src, dst):
+        """
+        Copy file contents from src to dst without preserving metadata (USB FAT32/exFAT drops it anyway).
+        On Linux the data is moved in-kernel, COPY_CHUNK_SIZE bytes at a time so progress can be
+        reported: os.copy_file_range first (a reflink on btrfs/XFS makes it metadata-only), then
+        os.sendfile. If the kernel does not support either for these files (EXDEV, ENOSYS, EOPNOTSUPP,
+        EINVAL), a user-space loop with a COPY_BUFFER_SIZE buffer is used; any other error (ENOSPC,
+        EFBIG, EIO) is raised at once. Other platforms use shutil.copyfile's native fast path.
+        The target is fsynced before returning, so a later read-back checks the drive, not the page cache.
+        """
+        if self.os_type != "Linux":
+            shutil.copyfile(src, dst)
+            with open(dst, "rb+") as fdst:
+                os.fsync(fdst.fileno())
+            return
+        total = os.path.getsize(src)
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+            copiers = []
+            if hasattr(os, "copy_file_range"):
+                copiers.append(("copy_file_range",
+                                lambda offset: os.copy_file_range(in_fd, out_fd, COPY_CHUNK_SIZE, offset, offset)))
+            if hasattr(os, "sendfile"):
+                copiers.append(("sendfile", lambda offset: os.sendfile(out_fd, in_fd, offset, COPY_CHUNK_SIZE)))
+            for name, copy_chunk in copiers:
+                offset = 0
+                try:
+                    while offset < total:
+                        self._check_cancelled()
+                        copied = copy_chunk(offset)
+                        if copied == 0:
+                            break
+                        offset += copied
+                        self.log(f"Copied {offset >> 20} of {total >> 20} MiB", LOG_INFO)
+                except OSError as ex:
+                    if ex.errno not in (errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL):
+                        raise
+                    self.log(f"{name} unavailable ({ex}); trying the next copy method.", LOG_DEBUG)
+                if offset >= total:
+                    break
+                # Start over from a clean target so a partial in-kernel copy cannot leave stale data.
+                fdst.seek(0)
+                fdst.truncate()
+            else:
+                fsrc.seek(0)
+                shutil.copyfileobj(fsrc, fdst, COPY_BUFFER_SIZE)
+            fdst.flush()
+            os.fsync(out_fd)
 
     def reformat_usb(self, usb_device, scheme):
         """
@@ -282,17 +999,19 @@ class FlashUtility:
             scheme (str): Partition scheme ('gpt' or 'mbr').
         WARNING: This operation is destructive and will erase all data on the drive.
         """
+        if not self.check_block_device(usb_device):
+            return
         try:
             if self.os_type == "Linux":
                 if scheme.lower() == "gpt":
-                    command = f"sudo parted {usb_device} mklabel gpt"
+                    command = ["sudo", "parted", usb_device, "mklabel", "gpt"]
                 elif scheme.lower() == "mbr":
-                    command = f"sudo parted {usb_device} mklabel msdos"
+                    command = ["sudo", "parted", usb_device, "mklabel", "msdos"]
                 else:
                     self.log("Unknown partition scheme.", LOG_ERROR)
                     return
-                self.log(f"Reformatting USB drive with command: {command}", LOG_INFO)
-                subprocess.run(command, shell=True, check=True)
+                self.log(f"Reformatting USB drive with command: {shlex.join(command)}", LOG_INFO)
+                self._run_command(command)
                 self.log("USB drive reformatted successfully.", LOG_INFO)
             elif self.os_type == "Windows":
                 self.log("Reformatting USB drive is not implemented for Windows.", LOG_WARNING)
@@ -302,20 +1021,112 @@ class FlashUtility:
             self.log(f"Error during reformatting: {e}", LOG_ERROR)
         except Exception as ex:
             self.log(f"Unexpected error: {ex}", LOG_ERROR)
+        finally:
+            self.invalidate_device_cache()
+
+    def _run_lsblk(self):
+        """
+        Run `lsblk -J` (Linux only) and return its parsed output.
+        The result is cached for LSBLK_CACHE_TTL seconds so the device list and the
+        details pane share one subprocess call.
+        Returns:
+            dict: Parsed lsblk JSON.
+        """
+        now = time.monotonic()
+        if self._lsblk_cache and now - self._lsblk_cache[0] < LSBLK_CACHE_TTL:
+            return self._lsblk_cache[1]
+        # Keep stdout as bytes: both json.loads and orjson.loads accept UTF-8 bytes directly.
+        result = subprocess.run(["lsblk", "-J", "-o", LSBLK_COLUMNS], capture_output=True, check=True)
+        parsed = orjson.loads(result.stdout) if orjson else json.loads(result.stdout)
+        self._lsblk_cache = (now, parsed)
+        return parsed
+
+    def invalidate_device_cache(self):
+        """Discard cached lsblk output; called after operations that change partitions or filesystems."""
+        self._lsblk_cache = None
+
+    def list_usb_devices(self):
+        """
+        List whole-disk block devices (Linux only).
+        With pyudev the disks are read from the udev database and sysfs without spawning a process;
+        otherwise the cached lsblk output is used.
+        Returns:
+            list: lsblk-style device dictionaries (keys are lowercase column names).
+        """
+        if self.udev is None:
+            return [dev for dev in self._run_lsblk().get("blockdevices", []) if dev.get("type") == "disk"]
+        devices = []
+        for device in self.udev.list_devices(subsystem="block", DEVTYPE="disk"):
+            if device.sys_name.startswith(VIRTUAL_DISK_PREFIXES):
+                continue
+            sectors = int(device.attributes.asstring("size"))  # Always 512-byte units in sysfs.
+            model = (device.get("ID_MODEL_ENC") or device.get("ID_MODEL") or "").replace("\\x20", " ").strip()
+            devices.append({"name": device.sys_name, "type": "disk", "size": self._format_size(sectors * 512),
+                            "model": model or None})
+        return devices
+
+    def start_device_monitor(self, callback):
+        """
+        Watch for disks being added or removed (requires pyudev).
+        callback(action) runs on the monitor's thread, after cached device data has been discarded;
+        action is the udev action string (e.g. "add", "remove").
+        Returns:
+            bool: True if monitoring started, False if udev or its netlink socket is unavailable.
+        """
+        if self.udev is None:
+            return False
+        try:
+            monitor = pyudev.Monitor.from_netlink(self.udev)
+            monitor.filter_by("block", device_type="disk")
+        except OSError as ex:  # No netlink socket, e.g. inside a sandbox or container
+            self.log(f"udev monitoring unavailable ({ex}); use Refresh to update the device list.", LOG_DEBUG)
+            return False
+
+        def handle(device):
+            self.invalidate_device_cache()
+            callback(device.action)
+
+        self._device_observer = pyudev.MonitorObserver(monitor, callback=handle, name="udev-monitor")
+        self._device_observer.daemon = True
+        self._device_observer.start()
+        return True
+
+    @staticmethod
+    def _format_size(size):
+        """Format a byte count the way lsblk does (binary units, e.g. 14.9G)."""
+        for unit in "BKMGTP":
+            if size < 1024 or unit == "P":
+                break
+            size /= 1024
+        return f"{size:.1f}".rstrip("0").rstrip(".") + unit
 
     def get_usb_details(self, usb_device):
         """
         Retrieve detailed USB drive information.
-        For Linux, uses the lsblk command with additional columns.
+        For Linux, formats the cached lsblk output for the given device (or all devices if
+        it is not found) as a table including its partitions.
         Returns:
             str: Detailed information or an error message.
         """
         try:
             if self.os_type == "Linux":
-                result = subprocess.run(["lsblk", "-o", "NAME,FSTYPE,SIZE,TYPE,MOUNTPOINT,LABEL,MODEL"],
-                                        capture_output=True, text=True, check=True)
-                details = result.stdout.strip()
-                return details
+                devices = self._run_lsblk().get("blockdevices", [])
+                name = os.path.basename(usb_device)
+                selected = [dev for dev in devices if dev.get("name") == name] or devices
+                columns = LSBLK_COLUMNS.split(",")
+                rows = [columns]
+
+                def add_rows(dev, depth):
+                    rows.append(["  " * depth + dev.get("name", "")] +
+                                [str(dev.get(col.lower()) or "") for col in columns[1:]])
+                    for child in dev.get("children", []):
+                        add_rows(child, depth + 1)
+
+                for dev in selected:
+                    add_rows(dev, 0)
+                widths = [max(len(row[i]) for row in rows) for i in range(len(columns))]
+                return "\n".join("  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip()
+                                 for row in rows)
             elif self.os_type == "Windows":
                 return "USB details not implemented for Windows."
             else:
@@ -326,26 +1137,315 @@ class FlashUtility:
     def compute_sha256(self, file_path):
         """
         Compute the SHA256 hash of the specified file.
+        Throughput depends on Python being linked against an OpenSSL build with SHA-NI
+        enabled (the default on modern distributions).
+        On 64-bit builds the file is mmapped and hashed in HASH_SLICE_SIZE steps; otherwise (or if
+        mmap fails) it is streamed through hashlib.file_digest or a buffered read loop.
+        Progress is reported through progress_callback (and logged every HASH_PROGRESS_INTERVAL bytes).
         Returns:
             str: The computed hexadecimal hash string, or None on error.
         """
-        sha256_hash = hashlib.sha256()
+        cached = self._cached_digest(file_path)
+        if cached:
+            self.log(f"Using cached SHA256 for {file_path}", LOG_DEBUG)
+            return cached
         try:
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    sha256_hash.update(chunk)
-            return sha256_hash.hexdigest()
+            digest = self._sha256_mmap(file_path)
+            if digest is None:
+                digest = self._sha256_stream(file_path)
+            self._store_digest(file_path, digest)
+            return digest
         except Exception as ex:
             self.log(f"Error computing hash: {ex}", LOG_ERROR)
             return None
 
+    def _sha256_mmap(self, file_path):
+        """
+        Hash a file by mapping it into memory and passing it to OpenSSL in large slices, which keeps
+        per-call overhead negligible while letting progress be reported between slices.
+        Skipped for empty files and on 32-bit interpreters, where multi-GB ISOs exceed the address space.
+        Returns:
+            str: The hexadecimal digest, or None if the mmap path is not usable.
+        """
+        size = os.path.getsize(file_path)
+        if sys.maxsize <= 2 ** 32 or size == 0:
+            return None
+        try:
+            with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                advance = self._progress_reporter("Hashed", size, HASH_PROGRESS_INTERVAL)
+                sha256_hash = _sha256()
+                with memoryview(mm) as view:
+                    for start in range(0, size, HASH_SLICE_SIZE):
+                        chunk = view[start:start + HASH_SLICE_SIZE]
+                        sha256_hash.update(chunk)
+                        chunk.release()  # Before advance(), which raises on cancellation.
+                        advance(HASH_SLICE_SIZE if start + HASH_SLICE_SIZE <= size else size - start)
+                return sha256_hash.hexdigest()
+        except (OSError, ValueError) as ex:
+            self.log(f"mmap hashing unavailable ({ex}); streaming instead.", LOG_DEBUG)
+            return None
+
+    def _sha256_stream(self, file_path):
+        """
+        Hash a file by streaming it through hashlib.
+        Returns:
+            str: The hexadecimal digest.
+        """
+        with open(file_path, "rb", buffering=0) as f:
+            # Ask the kernel to read ahead aggressively; the file is consumed front to back.
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            # Python 3.11+ runs the whole read/update loop in C and releases the GIL,
+            # but cannot report progress, so it is only used when nobody is listening.
+            if hasattr(hashlib, "file_digest") and not self.progress_callback:
+                return hashlib.file_digest(f, _sha256).hexdigest()
+            advance = self._progress_reporter("Hashed", os.fstat(f.fileno()).st_size, HASH_PROGRESS_INTERVAL)
+            # Reuse one buffer instead of allocating a new bytes object per chunk.
+            sha256_hash = _sha256()
+            buf = bytearray(HASH_CHUNK_SIZE)
+            view = memoryview(buf)
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                sha256_hash.update(view[:n])
+                advance(n)
+            return sha256_hash.hexdigest()
+
+    def find_published_sha256(self, iso_path, url=None):
+        """
+        Look up a published SHA256 for an ISO without reading the ISO itself.
+        Checks a local sidecar file (<iso_path>.sha256) first, then the SHA256SUMS file
+        published next to the download URL on the mirror.
+        Args:
+            iso_path (str): Path of the local ISO.
+            url (str): Download URL of the ISO, if known.
+        Returns:
+            str: The published hexadecimal digest, or None if none was found.
+        """
+        name = os.path.basename(url) if url else os.path.basename(iso_path)
+        try:
+            sidecar = iso_path + ".sha256"
+            if os.path.exists(sidecar):
+                with open(sidecar, "r") as f:
+                    return self._parse_sha256sums(f.read(), name)
+            if url:
+                sums_url = url.rsplit("/", 1)[0] + "/SHA256SUMS"
+                response = self.http.get(sums_url, timeout=10)
+                if response.status_code == 200:
+                    return self._parse_sha256sums(response.text, name)
+        except Exception as ex:
+            self.log(f"Could not look up published checksum: {ex}", LOG_DEBUG)
+        return None
+
+    @staticmethod
+    def _parse_sha256sums(text, file_name):
+        """
+        Extract the digest for file_name from sha256sum-style ("<hash>  name", "<hash> *name"),
+        BSD-style ("SHA256 (name) = <hash>") or bare single-hash checksum text.
+        Returns:
+            str: The lowercase digest, or None if file_name is not listed.
+        """
+        for line in text.splitlines():
+            line = line.strip()
+            bsd = re.match(r"SHA256 \((.+)\) = ([0-9a-fA-F]{64})$", line)
+            if bsd:
+                if bsd.group(1) == file_name:
+                    return bsd.group(2).lower()
+                continue
+            parts = line.split(None, 1)
+            if parts and re.fullmatch(r"[0-9a-fA-F]{64}", parts[0]):
+                if len(parts) == 1 or parts[1].lstrip("*") == file_name:
+                    return parts[0].lower()
+        return None
+
+    def _load_digest_cache(self):
+        """
+        Load the persisted digest cache, dropping entries whose files no longer exist.
+        Returns:
+            dict: The cache contents, or an empty dict if it is missing or unreadable.
+        """
+        try:
+            with open(HASH_CACHE_PATH, "r") as f:
+                cache = json.load(f)
+            return {path: entry for path, entry in cache.items() if os.path.exists(path)}
+        except FileNotFoundError:
+            return {}
+        except Exception as ex:
+            self.log(f"Ignoring unreadable hash cache: {ex}", LOG_WARNING)
+            return {}
+
+    def _cached_digest(self, file_path):
+        """
+        Return the cached SHA256 for file_path if its size and mtime still match, otherwise None.
+        """
+        path = os.path.abspath(file_path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        # _store_digest serializes this dict on other threads; mutate it only under the same lock.
+        with self._digest_lock:
+            entry = self.digest_cache.get(path)
+            if not entry:
+                return None
+            if entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+                entry["hits"] = entry.get("hits", 0) + 1
+                return entry.get("sha256")
+            self.digest_cache.pop(path, None)
+            return None
+
+    def _store_digest(self, file_path, digest):
+        """
+        Record the SHA256 for file_path along with its current size and mtime, and write the cache through to disk.
+        Beyond HASH_CACHE_MAX_ENTRIES, the entries with the fewest cache hits are evicted.
+        """
+        path = os.path.abspath(file_path)
+        try:
+            st = os.stat(path)
+            with self._digest_lock:
+                self.digest_cache[path] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest, "hits": 0}
+                excess = len(self.digest_cache) - HASH_CACHE_MAX_ENTRIES
+                if excess > 0:
+                    candidates = [p for p in self.digest_cache if p != path]
+                    candidates.sort(key=lambda p: self.digest_cache[p].get("hits", 0))
+                    for stale in candidates[:excess]:
+                        del self.digest_cache[stale]
+                os.makedirs(os.path.dirname(HASH_CACHE_PATH), exist_ok=True)
+                tmp_path = HASH_CACHE_PATH + ".tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(self.digest_cache, f)
+                os.replace(tmp_path, HASH_CACHE_PATH)
+        except Exception as ex:
+            self.log(f"Could not update hash cache: {ex}", LOG_WARNING)
+
+    def compute_blake3(self, file_path, length=None):
+        """
+        Compute the BLAKE3 hash of a file, or of its first `length` bytes (used for block devices,
+        which are larger than the image written to them). Requires the optional blake3 package.
+        Returns:
+            str: The computed hexadecimal hash string, or None on error or if blake3 is unavailable.
+        """
+        if blake3 is None:
+            self.log("BLAKE3 is not available; install the 'blake3' package.", LOG_WARNING)
+            return None
+        try:
+            if length is None:
+                # update_mmap hashes the whole file via mmap using all SIMD lanes and threads.
+                return blake3.blake3(max_threads=blake3.blake3.AUTO).update_mmap(file_path).hexdigest()
+            return self._hash_prefix(file_path, length, blake3.blake3(max_threads=blake3.blake3.AUTO))
+        except Exception as ex:
+            self.log(f"Error computing BLAKE3 hash: {ex}", LOG_ERROR)
+            return None
+
+    def compute_fast_hash(self, file_path, algo="xxh3", length=None):
+        """
+        Compute a fast hash for local integrity checks (e.g. post-flash verification), where no
+        published SHA256 has to be matched. Keep using compute_sha256 for predefined OS digests.
+        Args:
+            file_path (str): File or block device to hash.
+            algo (str): "xxh3" (requires the optional xxhash package) or "blake3" (requires blake3).
+            length (int): Hash only the first `length` bytes; required for block devices.
+        Returns:
+            str: The computed hexadecimal hash string, or None on error or if algo is unavailable.
+        """
+        if algo == "blake3":
+            return self.compute_blake3(file_path, length)
+        if algo != "xxh3" or xxhash is None:
+            self.log(f"Fast hash '{algo}' is not available.", LOG_WARNING)
+            return None
+        try:
+            if length is None:
+                length = os.path.getsize(file_path)
+            return self._hash_prefix(file_path, length, xxhash.xxh3_64(), FAST_HASH_CHUNK_SIZE)
+        except Exception as ex:
+            self.log(f"Error computing {algo} hash: {ex}", LOG_ERROR)
+            return None
+
+    @staticmethod
+    def fast_hash_algo():
+        """
+        Pick the fastest installed verification hash.
+        Returns:
+            str: "xxh3", "blake3", or None if neither optional package is installed.
+        """
+        if xxhash is not None:
+            return "xxh3"
+        if blake3 is not None:
+            return "blake3"
+        return None
+
+    @staticmethod
+    def _hash_prefix(file_path, length, hasher, chunk_size=HASH_CHUNK_SIZE):
+        """
+        Feed the first `length` bytes of file_path into hasher using a reused buffer.
+        Returns:
+            str: The hexadecimal digest.
+        """
+        buf = bytearray(chunk_size)
+        view = memoryview(buf)
+        remaining = length
+        with open(file_path, "rb", buffering=0) as f:
+            while remaining > 0:
+                n = f.readinto(view[:min(remaining, chunk_size)])
+                if not n:
+                    break
+                hasher.update(view[:n])
+                remaining -= n
+        return hasher.hexdigest()
+
+    def verify_copy(self, source_path, target_path):
+        """
+        Verify a flash or copy by reading back the first len(source) bytes of the target
+        (a block device or a copied file) and comparing hashes with the source.
+        Both sides are local, so a fast hash (xxh3 or BLAKE3) is used when installed; otherwise SHA256.
+        Returns:
+            bool: True if the contents match, False on mismatch or error, or None if verification
+            was skipped because the target is not readable (e.g. a device flashed through sudo).
+        """
+        if not os.access(target_path, os.R_OK):
+            self.log(f"Skipping verification: {target_path} is not readable by this user.", LOG_INFO)
+            return None
+        try:
+            size = os.path.getsize(source_path)
+            algo = self.fast_hash_algo()
+            if algo:
+                expected = self.compute_fast_hash(source_path, algo)
+                actual = self.compute_fast_hash(target_path, algo, length=size)
+            else:
+                expected = self.compute_sha256(source_path)
+                actual = self._hash_prefix(target_path, size, _sha256())
+        except PermissionError as ex:
+            self.log(f"Skipping verification: cannot read back {target_path} ({ex}).", LOG_INFO)
+            return None
+        except Exception as ex:
+            self.log(f"Verification error: {ex}", LOG_ERROR)
+            return False
+        if actual is None:
+            self.log(f"Could not read back {target_path} for verification.", LOG_WARNING)
+            return False
+        if expected and expected == actual:
+            self.log(f"Verified {target_path} against {source_path}.", LOG_INFO)
+            return True
+        self.log(f"Verification failed: {target_path} does not match {source_path}.", LOG_ERROR)
+        return False
+
     def cleanup(self):
         """
-        Clean up temporary files and directories created during operations.
+        Clean up temporary files and directories created during operations, close the HTTP session
+        and stop the device monitor.
         """
+        if self._device_observer is not None:
+            self._device_observer.send_stop()
+        self.http.close()
         try:
-            if os.path.exists(self.temp_dir):
-                shutil.rmtree(self.temp_dir)
-                self.log("Cleaned up temporary files.", LOG_DEBUG)
+            # shutil.rmtree already walks with os.scandir and unlinks relative to directory fds,
+            # so the only redundant stat left was an exists() check in front of it.
+            shutil.rmtree(self.temp_dir)
+            self.log("Cleaned up temporary files.", LOG_DEBUG)
+        except FileNotFoundError:
+            pass
         except Exception as ex:
             self.log(f"Error during cleanup: {ex}", LOG_ERROR)
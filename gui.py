@@ -19,18 +19,60 @@ Usage:
 import sys
 import os
 import platform
-import subprocess
-import json
-import requests
+import threading
+import traceback
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QFileDialog, QPushButton, QLabel,
     QLineEdit, QListWidget, QTextEdit, QRadioButton, QHBoxLayout, QVBoxLayout,
-    QButtonGroup, QMessageBox, QSplitter, QComboBox, QGroupBox, QAction
+    QButtonGroup, QMessageBox, QSplitter, QComboBox, QGroupBox, QAction, QProgressBar, QProgressDialog
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
 
 # Import backend functionality and constants.
-from backend import FlashUtility, LOG_DEBUG, LOG_INFO, LOG_WARNING, LOG_ERROR, PREDEFINED_OS, VENTOY_URLS
+from backend import (FlashUtility, LOG_DEBUG, LOG_INFO, LOG_WARNING, LOG_ERROR, predefined_os, match_predefined_os,
+                     match_predefined_sha256, rebuild_distro_matcher)
+
+# How long (ms) the application waits on exit for exit-safe background queries (link checks, device lists).
+EXIT_GRACE_MS = 5000
+# Threads in the GUI's background pool. Its jobs block on I/O for minutes (flashing, downloads), so the
+# count is fixed rather than tied to the CPU count, leaving room for link checks and device refreshes.
+BACKGROUND_THREADS = 8
+
+class WorkerSignals(QObject):
+    """Signals emitted by a Worker (QRunnable is not a QObject and cannot define signals itself)."""
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+class Worker(QRunnable):
+    """
+    Runs a blocking backend call on a background QThreadPool so the Qt event loop stays responsive.
+    The call's return value (None if it raised) is delivered on the GUI thread via signals.finished;
+    an exception is reported through signals.error (and printed) before finished is emitted.
+    Signals whose receivers were already destroyed at shutdown are dropped.
+    """
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = WorkerSignals()
+
+    def run(self):
+        # An exception escaping QRunnable.run aborts the whole process under PyQt5, so report it here.
+        result = None
+        try:
+            result = self.fn(*self.args)
+        except Exception as ex:
+            traceback.print_exc()
+            self._emit(self.signals.error, f"{type(ex).__name__}: {ex}")
+        self._emit(self.signals.finished, result)
+
+    @staticmethod
+    def _emit(signal, value):
+        # During shutdown the window (or WorkerSignals) may already be deleted by the time a query ends.
+        try:
+            signal.emit(value)
+        except RuntimeError:
+            pass
 
 class VentoyFlasherGUI(QMainWindow):
     """
@@ -38,6 +80,16 @@ class VentoyFlasherGUI(QMainWindow):
     It uses the FlashUtility class from backend.py to perform operations and displays
     logging output and status messages.
     """
+    # Backend log messages may originate on worker threads; the signal marshals them to the GUI thread.
+    log_requested = pyqtSignal(str, int)
+    # Transfer progress (label, percent) from the backend, marshalled the same way.
+    progress_requested = pyqtSignal(str, int)
+    # udev hotplug notifications (the udev action) arrive on the monitor thread.
+    device_changed = pyqtSignal(str)
+    # Display names for log levels, and the matching log-line prefixes (built once, not per message).
+    _LEVEL_NAMES = {LOG_DEBUG: "DEBUG", LOG_INFO: "INFO", LOG_WARNING: "WARNING", LOG_ERROR: "ERROR"}
+    _LEVEL_PREFIXES = {level: f"[{name}] " for level, name in _LEVEL_NAMES.items()}
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Ventoy Flasher")
@@ -46,12 +98,50 @@ class VentoyFlasherGUI(QMainWindow):
         self.setStyleSheet("background-color: black; color: #39FF14; font-family: 'Courier New'; font-size: 12px;")
         # Default logging level is INFO.
         self.log_level = LOG_INFO
+        # Workers currently running on the thread pool (kept referenced until they finish).
+        self._workers = set()
+        # Dedicated pool for blocking backend calls (the global pool is sized for CPU-bound work).
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(BACKGROUND_THREADS)
+        # How many running workers have disabled each widget; it is re-enabled when its count drops to zero.
+        self._busy_widgets = {}
+        # The subset of those that write, download or hash (not safe to abandon when the window closes).
+        self._operations = set()
+        # True once the user chose to exit while operations were running; the window closes when they end.
+        self._exit_pending = False
+        # Formatted log lines waiting for the next periodic flush to the log pane.
+        self._log_buffer = []
+        # True while a background link validation is in flight (a second request is ignored).
+        self._link_check_running = False
+        # Widget contents still to be filled; populated in showEvent rather than before first paint.
+        self._pending_refresh = {"devices": platform.system() == "Linux", "distros": True}
 
         self.initUI()
-        self.flash_util = FlashUtility(log_callback=self.log_message)
+        self.log_requested.connect(self.log_message)
+        self.progress_requested.connect(self.show_progress)
+        self.flash_util = FlashUtility(log_callback=self.log_requested.emit,
+                                       progress_callback=self.progress_requested.emit)
+        # Refresh the device list on hotplug; a burst of udev events (add, change) causes one refresh.
+        self._device_refresh_timer = QTimer(self)
+        self._device_refresh_timer.setSingleShot(True)
+        self._device_refresh_timer.setInterval(250)
+        self._device_refresh_timer.timeout.connect(self._refresh_devices_if_visible)
+        self.device_changed.connect(lambda _action: self._device_refresh_timer.start())
+        if self.flash_util.start_device_monitor(self.device_changed.emit):
+            self.log_message("Watching for USB devices being plugged in or removed.", LOG_DEBUG)
         self.validate_os_links()
         self.create_menu()
 
+    def showEvent(self, event):
+        """Fill the device and distro lists on first show (or after a refresh deferred while hidden)."""
+        super().showEvent(event)
+        if self._pending_refresh["devices"]:
+            self._pending_refresh["devices"] = False
+            self.populate_usb_devices()
+        if self._pending_refresh["distros"]:
+            self._pending_refresh["distros"] = False
+            self.refresh_distro_list()
+
     def create_menu(self):
         """
         Create the menu bar with File, Preferences, View, and Help menus.
@@ -62,7 +152,7 @@ class VentoyFlasherGUI(QMainWindow):
         # --- File Menu ---
         file_menu = menubar.addMenu("File")
         update_links_action = QAction("Update ISO Links", self)
-        update_links_action.triggered.connect(self.update_iso_links)
+        update_links_action.triggered.connect(lambda: self.update_iso_links())
         exit_action = QAction("Exit", self)
         exit_action.triggered.connect(self.close)
         file_menu.addAction(update_links_action)
@@ -72,7 +162,8 @@ class VentoyFlasherGUI(QMainWindow):
         # --- Preferences Menu ---
         pref_menu = menubar.addMenu("Preferences")
         update_dict_action = QAction("Manually Update OS Dictionary", self)
-        update_dict_action.triggered.connect(self.update_iso_links)
+        # A manual update bypasses the link-check cache.
+        update_dict_action.triggered.connect(lambda: self.update_iso_links(force=True))
         pref_menu.addAction(update_dict_action)
 
         # --- View Menu (Logging Level) ---
@@ -105,8 +196,7 @@ class VentoyFlasherGUI(QMainWindow):
     def set_log_level(self, level):
         """Set the current logging level and log the change."""
         self.log_level = level
-        level_name = {LOG_DEBUG: "DEBUG", LOG_INFO: "INFO", LOG_WARNING: "WARNING", LOG_ERROR: "ERROR"}.get(level, "INFO")
-        self.log_message(f"Logging level set to {level_name}.", LOG_INFO)
+        self.log_message(f"Logging level set to {self._LEVEL_NAMES.get(level, 'INFO')}.", LOG_INFO)
 
     def show_about(self):
         """Display an About dialog."""
@@ -120,32 +210,14 @@ class VentoyFlasherGUI(QMainWindow):
                                 "Refer to the README.md on GitHub for detailed documentation.",
                                 QMessageBox.Ok)
 
-    def update_iso_links(self):
+    def update_iso_links(self, force=False):
         """
-        Update the ISO links in the PREDEFINED_OS dictionary.
-        Currently, this function re-validates the URLs and removes any that are unreachable.
+        Update the ISO links in the predefined OS catalog.
+        Currently, this function re-validates the URLs and removes any that are unreachable;
+        recently probed URLs are taken from the cache unless force is set.
         """
         self.log_message("Updating ISO links...", LOG_INFO)
-        for os_name, info in list(PREDEFINED_OS.items()):
-            url = info.get("url")
-            try:
-                response = requests.head(url, allow_redirects=True, timeout=5)
-                if response.status_code != 200:
-                    self.log_message(f"Link for {os_name} returned status {response.status_code}. Removing option.", LOG_WARNING)
-                    PREDEFINED_OS.pop(os_name)
-                    # Remove from distro list widget.
-                    for i in range(self.distro_list.count()):
-                        if self.distro_list.item(i).text() == os_name:
-                            self.distro_list.takeItem(i)
-                            break
-            except Exception as ex:
-                self.log_message(f"Error validating link for {os_name}: {ex}. Removing option.", LOG_ERROR)
-                PREDEFINED_OS.pop(os_name)
-                for i in range(self.distro_list.count()):
-                    if self.distro_list.item(i).text() == os_name:
-                        self.distro_list.takeItem(i)
-                        break
-        self.log_message("ISO links update complete.", LOG_INFO)
+        self.validate_os_links(force)
 
     def initUI(self):
         """Initialize and arrange GUI widgets."""
@@ -162,7 +234,14 @@ class VentoyFlasherGUI(QMainWindow):
         self.usb_device_label = QLabel(r"USB Device (e.g., /dev/sdx or \\.\PhysicalDriveN):")
         self.usb_device_combo = QComboBox()
         self.usb_device_combo.setEditable(True)
-        self.usb_device_combo.currentTextChanged.connect(self.update_usb_device_text)
+        # Debounce edits: typing fires currentTextChanged per keystroke, so only handle the text
+        # once it has been stable for 250 ms.
+        self._device_text_timer = QTimer(self)
+        self._device_text_timer.setSingleShot(True)
+        self._device_text_timer.setInterval(250)
+        self._device_text_timer.timeout.connect(
+            lambda: self.update_usb_device_text(self.usb_device_combo.currentText()))
+        self.usb_device_combo.currentTextChanged.connect(lambda _text: self._device_text_timer.start())
         self.refresh_btn = QPushButton("Refresh Devices")
         self.refresh_btn.clicked.connect(self.populate_usb_devices)
 
@@ -177,9 +256,9 @@ class VentoyFlasherGUI(QMainWindow):
         self.selected_iso_path = ""
 
         # --- Predefined OS List ---
-        self.distro_list = QListWidget()
-        for os_name in PREDEFINED_OS.keys():
-            self.distro_list.addItem(os_name)
+        self.distro_list = QListWidget()  # Filled by refresh_distro_list() once the window is shown.
+        # All rows are single-line text, so Qt can size them from the first row instead of measuring each.
+        self.distro_list.setUniformItemSizes(True)
         self.distro_list.itemClicked.connect(self.select_distro)
 
         # --- Flash and Ventoy Buttons ---
@@ -204,6 +283,12 @@ class VentoyFlasherGUI(QMainWindow):
         # --- Log Output Pane ---
         self.log_output = QTextEdit()
         self.log_output.setReadOnly(True)
+        # Coalesce log output: the first buffered line arms a 50 ms single-shot flush, so a burst of
+        # lines causes one relayout, and an idle log pane costs no timer wakeups.
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(50)
+        self._log_timer.timeout.connect(self._flush_log)
 
         # --- Status Pane (Warnings/Recommendations) ---
         self.status_pane = QTextEdit()
@@ -211,6 +296,11 @@ class VentoyFlasherGUI(QMainWindow):
         self.status_pane.setFixedHeight(80)
         self.status_pane.setStyleSheet("background-color: #222; color: #FF4500;")
 
+        # --- Progress Bar (shown while a download or flash reports progress) ---
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.hide()
+
         # --- Layouts ---
         mode_layout = QHBoxLayout()
         mode_layout.addWidget(self.dd_mode_radio)
@@ -261,58 +351,132 @@ class VentoyFlasherGUI(QMainWindow):
         main_widget = QWidget()
         main_layout = QVBoxLayout()
         main_layout.addWidget(splitter)
+        main_layout.addWidget(self.progress_bar)
         main_layout.addWidget(self.status_pane)
         main_widget.setLayout(main_layout)
         self.setCentralWidget(main_widget)
 
-        # Populate USB devices if on Linux.
-        if platform.system() == "Linux":
-            self.populate_usb_devices()
-
     def update_usb_device_text(self, text):
         """Placeholder for additional actions when the USB device selection changes."""
         pass
 
     def populate_usb_devices(self):
-        """Populate the USB device combo box using lsblk (Linux only)."""
-        self.usb_device_combo.clear()
+        """
+        Refresh the USB device combo box (Linux only). The device list (lsblk or udev) is read on a
+        worker thread so the event loop never waits on a child process; _fill_usb_devices applies it.
+        """
+        # refresh_btn is not handed to run_in_background: its enabled state belongs to toggle_mode.
+        self.run_in_background([], self._fill_usb_devices, self._list_usb_devices, exit_safe=True)
+
+    def _list_usb_devices(self):
+        """
+        Worker-thread helper for populate_usb_devices.
+        Returns:
+            tuple: (device list, None), or (None, exception) if enumeration failed.
+        """
         try:
-            result = subprocess.run(["lsblk", "-J", "-o", "NAME,TYPE,SIZE,MODEL"], capture_output=True, text=True, check=True)
-            lsblk_json = json.loads(result.stdout)
-            devices = lsblk_json.get("blockdevices", [])
-            for dev in devices:
-                if dev.get("type") == "disk":
-                    name = dev.get("name")
-                    size = dev.get("size")
-                    model = dev.get("model") or "Unknown Model"
-                    device_entry = f"/dev/{name} – {model} ({size})"
-                    self.usb_device_combo.addItem(device_entry)
-            self.log_message("USB devices list updated.", LOG_INFO)
+            return self.flash_util.list_usb_devices(), None
         except Exception as ex:
-            self.log_message(f"Error retrieving USB devices: {ex}", LOG_ERROR)
+            return None, ex
 
-    def validate_os_links(self):
+    def _fill_usb_devices(self, result):
+        """
+        Replace the combo box entries with the enumerated devices, keeping the current selection
+        if that device is still present. Signals are blocked while the items are replaced;
+        currentTextChanged is then emitted once, and only if the text actually changed.
+        """
+        devices, error = result
+        if error is not None:
+            self.log_message(f"Error retrieving USB devices: {error}", LOG_ERROR)
+            return
+        combo = self.usb_device_combo
+        previous = combo.currentText()
+        combo.blockSignals(True)
+        try:
+            combo.clear()
+            # One addItems call inserts every row with a single model update.
+            combo.addItems([
+                f"/dev/{dev.get('name')} \u2013 {dev.get('model') or 'Unknown Model'} ({dev.get('size') or '?'})"
+                for dev in devices])
+            index = combo.findText(previous)
+            if index >= 0:
+                combo.setCurrentIndex(index)
+        finally:
+            combo.blockSignals(False)
+        self.log_message("USB devices list updated.", LOG_INFO)
+        if combo.currentText() != previous:
+            combo.currentTextChanged.emit(combo.currentText())
+
+    def _refresh_devices_if_visible(self):
+        """Repopulate the device list after a hotplug event, or defer it to showEvent while hidden."""
+        if self.isVisible():
+            self.populate_usb_devices()
+        else:
+            self._pending_refresh["devices"] = True
+
+    def validate_os_links(self, force=False):
         """
         Validate download URLs for predefined OS images.
-        If a URL is unreachable, remove the option from the dictionary and UI.
+        All URLs are probed concurrently on a worker thread; _apply_dead_links then removes
+        unreachable ones from the dictionary and UI on the GUI thread. Results younger than
+        LINK_CACHE_TTL are reused unless force is set.
+        """
+        if self._link_check_running:
+            self.log_message("Link validation is already running.", LOG_DEBUG)
+            return
+        self._link_check_running = True
+        urls = {os_name: info.get("url") for os_name, info in predefined_os().items()}
+        self.run_in_background([], lambda results: self._apply_dead_links(urls, results or {}),
+                               self.flash_util.check_links, list(urls.values()), 5, force,
+                               exit_safe=True)
+
+    def _apply_dead_links(self, urls, results):
         """
+        Remove catalog entries whose URL probe failed or did not return a 2xx status.
+        Args:
+            urls (dict): OS name -> URL, as submitted for probing.
+            results (dict): URL -> HTTP status code or exception, from FlashUtility.check_links.
+        """
+        self._link_check_running = False
         to_remove = []
-        for os_name, info in list(PREDEFINED_OS.items()):
-            url = info.get("url")
-            try:
-                response = requests.head(url, allow_redirects=True, timeout=5)
-                if response.status_code != 200:
-                    self.log_message(f"Warning: URL for {os_name} returned status {response.status_code}. Removing option.", LOG_WARNING)
-                    to_remove.append(os_name)
-            except Exception as ex:
-                self.log_message(f"Error validating URL for {os_name}: {ex}. Removing option.", LOG_ERROR)
+        for os_name, url in urls.items():
+            result = results.get(url)
+            if result is None:
+                continue  # Not probed (the check itself failed); keep the entry.
+            if isinstance(result, Exception):
+                self.log_message(f"Error validating URL for {os_name}: {result}. Removing option.", LOG_ERROR)
                 to_remove.append(os_name)
-        for os_name in to_remove:
-            PREDEFINED_OS.pop(os_name, None)
-            for i in range(self.distro_list.count()):
-                if self.distro_list.item(i).text() == os_name:
-                    self.distro_list.takeItem(i)
-                    break
+            elif not 200 <= result < 300:  # A ranged GET fallback answers 206.
+                self.log_message(f"Warning: URL for {os_name} returned status {result}. Removing option.", LOG_WARNING)
+                to_remove.append(os_name)
+        if to_remove:
+            for os_name in to_remove:
+                predefined_os().pop(os_name, None)
+            rebuild_distro_matcher()
+            self.refresh_distro_list()
+        self.log_message(f"ISO link validation complete ({len(to_remove)} unreachable removed).", LOG_INFO)
+
+    def refresh_distro_list(self):
+        """
+        Repopulate the predefined OS list from the catalog in one batch, keeping the current selection.
+        Signals and repaints are suspended so the list is rebuilt with a single model reset and paint,
+        rather than one per removed row. While the window is hidden the rebuild is deferred to showEvent.
+        """
+        if not self.isVisible():
+            self._pending_refresh["distros"] = True
+            return
+        current = self.distro_list.currentItem()
+        selected = current.text() if current else None
+        self.distro_list.setUpdatesEnabled(False)
+        self.distro_list.blockSignals(True)
+        try:
+            self.distro_list.clear()
+            self.distro_list.addItems(list(predefined_os()))
+            if selected in predefined_os():
+                self.distro_list.setCurrentRow(list(predefined_os()).index(selected))
+        finally:
+            self.distro_list.blockSignals(False)
+            self.distro_list.setUpdatesEnabled(True)
 
     def toggle_mode(self):
         """Enable or disable widgets based on the selected flashing mode."""
@@ -336,19 +500,25 @@ class VentoyFlasherGUI(QMainWindow):
 
     def select_distro(self, item):
         """
-        When a predefined OS is selected, download its ISO using the URL from PREDEFINED_OS.
+        When a predefined OS is selected, download its ISO using the URL from the predefined OS catalog.
+        The download runs on a worker thread; the ISO is selected once it completes.
         """
         os_name = item.text()
-        info = PREDEFINED_OS.get(os_name)
+        info = predefined_os().get(os_name)
         if info:
             url = info.get("url")
             self.log_message(f"Downloading {os_name} ISO from {url}...", LOG_INFO)
-            iso_path = self.flash_util.download_file(url, f"{os_name}.iso")
-            if iso_path:
-                self.selected_iso_path = iso_path
-                self.log_message(f"{os_name} ISO downloaded and selected: {iso_path}", LOG_INFO)
-            else:
-                self.log_message(f"Failed to download {os_name} ISO.", LOG_ERROR)
+            self.run_in_background([self.distro_list, self.flash_btn, self.validate_iso_btn],
+                                   lambda iso_path: self._on_iso_downloaded(os_name, iso_path),
+                                   self.flash_util.download_file, url, f"{os_name}.iso")
+
+    def _on_iso_downloaded(self, os_name, iso_path):
+        """Select the downloaded ISO, or report the failure."""
+        if iso_path:
+            self.selected_iso_path = iso_path
+            self.log_message(f"{os_name} ISO downloaded and selected: {iso_path}", LOG_INFO)
+        else:
+            self.log_message(f"Failed to download {os_name} ISO.", LOG_ERROR)
 
     def flash_usb(self):
         """
@@ -366,16 +536,20 @@ class VentoyFlasherGUI(QMainWindow):
                 self.log_message("Please select the USB device from the dropdown.", LOG_WARNING)
                 return
             self.log_message("Starting dd flashing process...", LOG_INFO)
-            self.flash_util.run_dd_command(self.selected_iso_path, usb_device)
-            self.validate_operation(usb_device)
+            self.run_in_background([self.flash_btn, self.install_ventoy_btn, self.reformat_btn],
+                                   lambda ok, iso_path=self.selected_iso_path: self._on_write_done(ok, iso_path, usb_device),
+                                   self.flash_util.run_dd_command, self.selected_iso_path, usb_device)
         elif self.ventoy_mode_radio.isChecked():
             ventoy_mount = self.ventoy_mount_input.text().strip()
             if not ventoy_mount:
                 self.log_message("Please specify the Ventoy USB mount point (e.g., E:\\ or /mnt/ventoy).", LOG_WARNING)
                 return
             self.log_message("Copying ISO file to Ventoy drive...", LOG_INFO)
-            self.flash_util.copy_iso_to_ventoy(self.selected_iso_path, ventoy_mount)
-            self.validate_operation(ventoy_mount)
+            iso_path = self.selected_iso_path
+            self.run_in_background([self.flash_btn, self.install_ventoy_btn, self.reformat_btn],
+                                   lambda ok: self._on_write_done(
+                                       ok, iso_path, os.path.join(ventoy_mount, os.path.basename(iso_path))),
+                                   self.flash_util.copy_iso_to_ventoy, iso_path, ventoy_mount)
         else:
             self.log_message("Unknown flashing mode selected.", LOG_ERROR)
 
@@ -391,25 +565,42 @@ class VentoyFlasherGUI(QMainWindow):
             self.log_message("Please specify the Ventoy USB mount point or device identifier.", LOG_WARNING)
             return
         self.log_message("Starting Ventoy installation...", LOG_INFO)
-        self.flash_util.install_ventoy(ventoy_target)
+        self.run_in_background([self.flash_btn, self.install_ventoy_btn, self.reformat_btn],
+                               lambda _: None, self.flash_util.install_ventoy, ventoy_target)
 
     def reformat_usb(self):
         """
         Reformat the selected USB drive using the chosen partition scheme (GPT/MBR).
-        Displays a confirmation dialog before proceeding.
+        Displays a confirmation dialog before proceeding; the reformat then runs on a worker thread
+        behind a modal progress dialog whose Cancel button stops the partitioning command.
         """
-        usb_device = self.usb_device_combo.currentText().strip().split()[0]
+        usb_device = (self.usb_device_combo.currentText().split() or [""])[0]
         if not usb_device:
             self.log_message("Please select a USB device to reformat.", LOG_WARNING)
             return
+        if not self.flash_util.check_block_device(usb_device):
+            return
         scheme = self.reformat_combo.currentText()
         reply = QMessageBox.warning(self, "Warning: Reformat USB",
                                     f"WARNING: Reformatting {usb_device} as {scheme} will erase all data.\nDo you want to continue?",
                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
-        if reply == QMessageBox.Yes:
-            self.flash_util.reformat_usb(usb_device, scheme)
-        else:
+        if reply != QMessageBox.Yes:
             self.log_message("Reformatting canceled.", LOG_INFO)
+            return
+        dialog = QProgressDialog(f"Reformatting {usb_device} as {scheme}...", "Cancel", 0, 0, self)
+        dialog.setWindowModality(Qt.ApplicationModal)
+        dialog.setMinimumDuration(0)
+        dialog.canceled.connect(self.flash_util.cancel)
+        self.run_in_background([self.flash_btn, self.install_ventoy_btn, self.reformat_btn],
+                               lambda _: self._on_reformat_done(dialog),
+                               self.flash_util.reformat_usb, usb_device, scheme)
+        dialog.show()
+
+    def _on_reformat_done(self, dialog):
+        """Dismiss the reformat progress dialog once the worker has finished."""
+        dialog.canceled.disconnect(self.flash_util.cancel)
+        dialog.reset()
+        dialog.deleteLater()
 
     def get_usb_details(self):
         """
@@ -424,65 +615,176 @@ class VentoyFlasherGUI(QMainWindow):
 
     def validate_iso(self):
         """
-        Validate the selected ISO by computing its SHA256 hash and comparing it with the expected value,
-        if available in PREDEFINED_OS. Otherwise, prompt the user to verify manually.
+        Validate the selected ISO by computing its SHA256 hash and comparing it with the expected value:
+        a published checksum (local .sha256 sidecar or the mirror's SHA256SUMS) if one exists,
+        otherwise the value in the predefined OS catalog. If neither is available, prompt the user to verify manually.
         """
         if not self.selected_iso_path:
             self.log_message("Please select an ISO file first.", LOG_WARNING)
             return
-        computed_hash = self.flash_util.compute_sha256(self.selected_iso_path)
+        iso_path = self.selected_iso_path
+        os_name = match_predefined_os(os.path.basename(iso_path))
+        url = predefined_os().get(os_name, {}).get("url") if os_name else None
+        self.log_message("Computing ISO hash...", LOG_INFO)
+        self.run_in_background([self.validate_iso_btn],
+                               lambda result: self._on_iso_hashed(iso_path, os_name, *(result or (None, None))),
+                               self._hash_iso, iso_path, url)
+
+    def _hash_iso(self, iso_path, url):
+        """
+        Worker-thread helper: look up a published checksum, then hash the ISO
+        (digests already computed during download or flashing are reused).
+        Returns:
+            tuple: (published_hash or None, computed_hash or None)
+        """
+        published_hash = self.flash_util.find_published_sha256(iso_path, url)
+        return published_hash, self.flash_util.compute_sha256(iso_path)
+
+    def _on_iso_hashed(self, iso_path, os_name, published_hash, computed_hash):
+        """Compare the computed ISO hash with the published or predefined expected value."""
         if not computed_hash:
             self.log_message("Failed to compute ISO hash.", LOG_ERROR)
             return
-        iso_name = os.path.basename(self.selected_iso_path)
-        found = False
-        for os_name, info in PREDEFINED_OS.items():
-            if os_name.lower() in iso_name.lower():
-                found = True
-                expected_hash = info.get("hash")
-                if computed_hash == expected_hash:
-                    self.log_message(f"ISO validation passed for {os_name}.", LOG_INFO)
-                else:
-                    self.log_message(f"WARNING: ISO hash for {os_name} does not match expected value!", LOG_WARNING)
-                    self.status_pane.append(f"WARNING: {os_name} ISO hash mismatch. Expected: {expected_hash}, Got: {computed_hash}")
-                break
-        if not found:
-            self.log_message("No expected hash available for this ISO. Please verify manually.", LOG_WARNING)
-
-    def validate_operation(self, target):
-        """
-        Stub for post-operation validation. Could include additional checks (e.g., comparing device hash).
+        label = os_name or os.path.basename(iso_path)
+        if published_hash:
+            expected_hash = published_hash
+        elif os_name and os_name in predefined_os():
+            expected_hash = predefined_os()[os_name].get("hash")
+        else:
+            # The filename matched nothing; the digest itself may still identify a catalog entry.
+            known_os = match_predefined_sha256(computed_hash)
+            if known_os:
+                self.log_message(f"ISO validation passed: {label} matches {known_os}.", LOG_INFO)
+            else:
+                self.log_message("No expected hash available for this ISO. Please verify manually.", LOG_WARNING)
+            return
+        if computed_hash == expected_hash:
+            self.log_message(f"ISO validation passed for {label}.", LOG_INFO)
+        else:
+            self.log_message(f"WARNING: ISO hash for {label} does not match expected value!", LOG_WARNING)
+            self.status_pane.append(f"WARNING: {label} ISO hash mismatch. Expected: {expected_hash}, Got: {computed_hash}")
+
+    def _on_write_done(self, ok, iso_path, target):
+        """Verify a flash or copy once it has finished, unless it failed, was refused or exit is pending."""
+        if ok and not self._exit_pending:
+            self.validate_operation(iso_path, target)
+
+    def validate_operation(self, iso_path, target):
         """
-        try:
-            self.log_message(f"Validating operation on target: {target} ... (not fully implemented)", LOG_DEBUG)
-        except Exception as ex:
-            self.log_message(f"Validation error: {ex}", LOG_ERROR)
+        Post-operation validation: read back the target (device or copied ISO) on a worker thread
+        and compare it with the source ISO.
+        """
+        self.log_message(f"Verifying {target} against {iso_path}...", LOG_INFO)
+        self.run_in_background([self.flash_btn, self.install_ventoy_btn, self.reformat_btn],
+                               lambda ok: self._on_operation_verified(target, ok),
+                               self.flash_util.verify_copy, iso_path, target)
+
+    def _on_operation_verified(self, target, ok):
+        """
+        Surface a failed read-back verification in the status pane.
+        ok is None when verification was skipped (target not readable); that is not a failure.
+        """
+        if ok is False:
+            self.status_pane.append(f"WARNING: verification of {target} failed.")
+
+    def run_in_background(self, widgets, on_done, fn, *args, exit_safe=False):
+        """
+        Run fn(*args) on thread_pool, disabling the given widgets until it finishes
+        (a widget shared by several running jobs stays disabled until the last of them finishes).
+        on_done is called on the GUI thread with fn's return value.
+        Unless exit_safe is True (read-only queries), closing the window waits for the job to end.
+        """
+        for widget in widgets:
+            self._busy_widgets[widget] = self._busy_widgets.get(widget, 0) + 1
+            widget.setDisabled(True)
+        worker = Worker(fn, *args)
+        self._workers.add(worker)
+        if not exit_safe:
+            self._operations.add(worker)
+
+        def finished(result):
+            self._workers.discard(worker)
+            self._operations.discard(worker)
+            if not self._workers:
+                self.progress_bar.hide()
+            for widget in widgets:
+                self._busy_widgets[widget] -= 1
+                if not self._busy_widgets[widget]:
+                    del self._busy_widgets[widget]
+                    widget.setDisabled(False)
+            on_done(result)
+            if self._exit_pending and not self._operations:
+                self.close()
+
+        worker.signals.error.connect(lambda message: self.log_message(f"Background task failed: {message}", LOG_ERROR))
+        worker.signals.finished.connect(finished)
+        self.thread_pool.start(worker)
+
+    def show_progress(self, label, percent):
+        """Show a transfer's progress; a negative percent (unknown total) shows a busy indicator."""
+        if percent < 0:
+            self.progress_bar.setRange(0, 0)
+        else:
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setValue(percent)
+        self.progress_bar.setFormat(f"{label} %p%")
+        self.progress_bar.show()
 
     def log_message(self, message, level=LOG_INFO):
         """
-        Append a log message to the log output pane if its level is equal to or above the current log level.
+        Queue a log message for the log output pane if its level is equal to or above the current log level.
+        Queued lines are written by _flush_log, which the first queued line schedules.
         """
-        if level >= self.log_level:
-            level_name = {LOG_DEBUG: "DEBUG", LOG_INFO: "INFO", LOG_WARNING: "WARNING", LOG_ERROR: "ERROR"}.get(level, "INFO")
-            self.log_output.append(f"[{level_name}] {message}")
+        if level < self.log_level:
+            return
+        self._log_buffer.append(self._LEVEL_PREFIXES.get(level, "[INFO] ") + message)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _flush_log(self):
+        """Append all queued log lines to the log output pane in a single update."""
+        if self._log_buffer:
+            self.log_output.append("\n".join(self._log_buffer))
+            self._log_buffer.clear()
 
     def closeEvent(self, event):
         """
         Overridden close event: Confirm exit and clean up temporary files.
+        While a flash, copy, reformat, install, download or hash is running the window stays open:
+        the user is asked whether to abort it, and if so the operation is cancelled and the window
+        closes once it has ended. Cleanup then runs on a plain (non-daemon) thread, so the window
+        closes at once and the interpreter still lets it finish.
         """
-        reply = QMessageBox.question(self, 'Exit Confirmation',
-                                     "Are you sure you want to exit?",
-                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
-        if reply == QMessageBox.Yes:
-            self.flash_util.cleanup()
-            event.accept()
-        else:
+        if self._operations:
+            if not self._exit_pending:
+                reply = QMessageBox.warning(self, "Operation Still Running",
+                                            "An operation is still running. Exiting will abort it; an interrupted "
+                                            "flash or reformat leaves the drive unusable until it is redone.\n"
+                                            "Abort it and exit?",
+                                            QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+                if reply == QMessageBox.Yes:
+                    self._exit_pending = True
+                    self.flash_util.cancel(stop_all=True)
+                    self.log_message("Cancelling running operations; the application exits when they have stopped.",
+                                     LOG_WARNING)
             event.ignore()
+            return
+        if not self._exit_pending:
+            reply = QMessageBox.question(self, 'Exit Confirmation',
+                                         "Are you sure you want to exit?",
+                                         QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                event.ignore()
+                return
+        threading.Thread(target=self.flash_util.cleanup, name="cleanup").start()
+        event.accept()
 
 def main():
     """Main entry point for the Ventoy Flasher GUI application."""
     app = QApplication(sys.argv)
+    # Give exit-safe queries still on the pool a bounded chance to finish (cleanup runs on its own thread).
     window = VentoyFlasherGUI()
+    app.aboutToQuit.connect(lambda: window.thread_pool.waitForDone(EXIT_GRACE_MS))
     window.show()
     sys.exit(app.exec_())
 